@@ -1,39 +1,66 @@
 # main.py
-import re
 import asyncio
 import logging
 import signal
+
+try:
+    import uvloop  # optional: C event loop, big win on the WS-heavy paths
+except ImportError:
+    uvloop = None
+
 import discord #pycord
 from discord.commands import Option
-from datetime import datetime, timezone
+from discord.utils import utcnow
 
 import config
-from websocket_manager import WebsocketManager, strip_ansi
+from websocket_manager import WebsocketManager
 
 log = logging.getLogger(__name__)
 
+def _is_valid_username(username: str) -> bool:
+    """Equivalent of \\w{3,16} without entering the regex engine."""
+    # Underscores are mapped to an alnum so isalnum() can do one C-level scan.
+    return 3 <= len(username) <= 16 and username.replace("_", "a").isalnum()
+
+# Static parts of the /list embed; handlers copy this and fill in the
+# dynamic fields instead of rebuilding the embed from scratch.
+_LIST_EMBED_TEMPLATE = discord.Embed(title="Server Status", color=discord.Color.blue())
+
+def _truncate(s: str, n: int, suffix: str = "...") -> str:
+    """Clamp s to n chars, appending suffix only when something was cut."""
+    return s if len(s) <= n else s[:n - len(suffix)] + suffix
+
+# Indexed by is_connected + is_authenticated (0, 1 or 2)
+_STATUS_RESPONSES = (
+    "WS Status: ❌ Disconnected",
+    "WS Status: 🟠 Connected (Pending Auth)",
+    "WS Status: ✅ Auth & Listening",
+)
+
 # --- Global Variables & Setup ---
+_GUILD_IDS = [config.GUILD_ID] if config.GUILD_ID else None
+_commands_synced = False
 shutdown_event = asyncio.Event()
-intents = discord.Intents.default()
+# Slash commands and lifecycle events need no gateway event subscriptions;
+# Intents.none() keeps Discord from streaming events we never handle.
+intents = discord.Intents.none()
 bot = discord.Bot(intents=intents)
 websocket_manager = WebsocketManager()
 
-# --- Signal Handler & Events ---
-def handle_signal(sig, frame):
-    signal_name = signal.Signals(sig).name
-    log.warning(f"Signal {sig} ({signal_name}) received.")
-    shutdown_event.set()
-
+# --- Events ---
 @bot.event
 async def on_ready():
-    log.info(f'{bot.user.name} ready.')
-    guild_id = config.GUILD_ID
-    if guild_id:
-        log.info(f'Operating in guild {guild_id}')
-        await bot.sync_commands(guild_ids=[guild_id])
-    else:
-        log.warning("No GUILD_ID. Global commands.")
-        await bot.sync_commands()
+    global _commands_synced
+    log.info('%s ready.', bot.user.name)
+    # on_ready also fires on gateway reconnects; syncing commands is a
+    # rate-limited HTTP round trip, so only do it once per process.
+    if not _commands_synced:
+        if _GUILD_IDS:
+            log.info('Operating in guild %s', _GUILD_IDS[0])
+        else:
+            log.warning("No GUILD_ID. Global commands.")
+        await bot.sync_commands(guild_ids=_GUILD_IDS)
+        _commands_synced = True
     if not shutdown_event.is_set():
         await websocket_manager.start()
 
@@ -47,7 +74,7 @@ async def on_resumed():
 
 # --- Bot Commands ---
 @bot.slash_command(
-    guild_ids=[config.GUILD_ID] if config.GUILD_ID else None,
+    guild_ids=_GUILD_IDS,
     name="log",
     description="Prints recent console log lines."
 )
@@ -55,8 +82,9 @@ async def print_log_command(
     ctx: discord.ApplicationContext,
     lines: int = Option(int, "Number of recent lines", required=False, default=10, min_value=1, max_value=20)
 ):
-    log.info(f"/log by {ctx.author} (lines={lines})")
-    await ctx.defer(ephemeral=True) # Defer ephemeral response
+    # Defer immediately: everything else races Discord's 3s interaction deadline
+    await ctx.defer(ephemeral=True)
+    log.info("/log by %s (lines=%d)", ctx.author, lines)
 
     if not websocket_manager.is_authenticated:
         await ctx.followup.send("WS not ready.", ephemeral=True)
@@ -69,7 +97,6 @@ async def print_log_command(
         return
 
     header = f"📋 Last {len(logs)} log line(s):"
-    body = "\n".join(logs)
 
     # Define max length leaving room for header, code ticks, newline, and truncation message
     MAX_CONTENT_LENGTH = 2000
@@ -78,19 +105,39 @@ async def print_log_command(
     # Calculate max length for the actual log body content
     max_body_len = MAX_CONTENT_LENGTH - len(header) - len(CODE_BLOCK_MARKERS) - len(TRUNCATION_MSG) - 2 # -2 for newlines
 
-    if len(body) > max_body_len:
-        log.warning(f"Log content length ({len(body)}) exceeds limit ({max_body_len}), truncating.")
-        # Truncate from the beginning to show the most recent lines
-        body = body[-max_body_len:]
-        # Prepend truncation message
-        response_text = f"{header}\n{CODE_BLOCK_MARKERS[:3]}{TRUNCATION_MSG}\n{body}{CODE_BLOCK_MARKERS[3:]}"
+    # Fast path: a single line that fits needs no scan and no join.
+    if len(logs) == 1 and len(logs[0]) + 1 <= max_body_len:
+        await ctx.followup.send(
+            header + "\n```\n" + logs[0] + "\n```",
+            ephemeral=True
+        )
+        return
+
+    # Walk backwards over the lines to find how many of the most recent
+    # ones fit, so only the tail that will actually be sent gets joined.
+    total = 0
+    start = len(logs)
+    while start > 0 and total + len(logs[start - 1]) + 1 <= max_body_len:
+        total += len(logs[start - 1]) + 1
+        start -= 1
+
+    if start > 0:
+        log.warning("Log content exceeds limit (%d), truncating to last %d line(s).", max_body_len, len(logs) - start)
+        if start == len(logs):
+            # Even the newest line alone is too long; keep its tail.
+            body = logs[-1][-max_body_len:]
+        else:
+            body = "\n".join(logs[start:])
+        # Prepend truncation message; plain concatenation, no format machinery
+        response_text = header + "\n```" + TRUNCATION_MSG + "\n" + body + "\n```"
     else:
         # No truncation needed
-        response_text = f"{header}\n{CODE_BLOCK_MARKERS[:3]}\n{body}\n{CODE_BLOCK_MARKERS[3:]}"
+        body = "\n".join(logs)
+        response_text = header + "\n```\n" + body + "\n```"
 
     # Final length check (safety)
     if len(response_text) > MAX_CONTENT_LENGTH:
-         log.error(f"FATAL: Truncated log message still exceeds Discord limit ({len(response_text)} > {MAX_CONTENT_LENGTH}). This should not happen.")
+         log.error("FATAL: Truncated log message still exceeds Discord limit (%d > %d). This should not happen.", len(response_text), MAX_CONTENT_LENGTH)
          # Send a generic error instead of risking another HTTP 400
          await ctx.followup.send("❌ Error: Processed logs exceed display limit.", ephemeral=True)
     else:
@@ -98,29 +145,25 @@ async def print_log_command(
 
 
 @bot.slash_command(
-    guild_ids=[config.GUILD_ID] if config.GUILD_ID else None,
+    guild_ids=_GUILD_IDS,
     name="status",
     description="Shows WebSocket connection status."
 )
 async def websocket_status_command(ctx: discord.ApplicationContext):
-    log.info(f"/ws_status by {ctx.author}")
-    if websocket_manager.is_authenticated:
-        status = "✅ Auth & Listening"
-    elif websocket_manager.is_connected:
-        status = "🟠 Connected (Pending Auth)"
-    else:
-        status = "❌ Disconnected"
-    await ctx.respond(f"WS Status: {status}", ephemeral=True)
+    await ctx.defer(ephemeral=True)
+    log.info("/ws_status by %s", ctx.author)
+    idx = websocket_manager.is_connected + websocket_manager.is_authenticated
+    await ctx.followup.send(_STATUS_RESPONSES[idx], ephemeral=True)
 
 
 @bot.slash_command(
-    guild_ids=[config.GUILD_ID] if config.GUILD_ID else None,
+    guild_ids=_GUILD_IDS,
     name="list",  # Keep command name simple
     description="Lists the players currently online on the server."
 )
 async def list_players_command(ctx: discord.ApplicationContext):
-    log.info(f"Command /list invoked by {ctx.author}")
     await ctx.defer(ephemeral=True)
+    log.info("Command /list invoked by %s", ctx.author)
     if not websocket_manager.is_authenticated:
         await ctx.followup.send("❌ WS not authenticated.", ephemeral=True)
         return
@@ -134,8 +177,8 @@ async def list_players_command(ctx: discord.ApplicationContext):
     )
 
     if result_tuple:
-        response_type, response_log = result_tuple  # Unpack response type and raw log
-        cleaned_response = strip_ansi(response_log)
+        # Lines come back already ANSI-stripped by the manager
+        response_type, cleaned_response = result_tuple
 
         # Check if the response type matches what we expect for list success
         if response_type == config.LIST_SUCCESS:
@@ -148,30 +191,30 @@ async def list_players_command(ctx: discord.ApplicationContext):
                 match = list_pattern.search(cleaned_response)
                 if match:
                     try:
+                        # \d+ captures are already digit-only; the counts are only
+                        # substituted back into text, so skip the int() round trip.
                         current, max_p, p_list_str = match.groups()
-                        current = int(current)
-                        max_p = int(max_p)
                         p_names = [n.strip() for n in p_list_str.split(',') if n.strip()] if p_list_str else []
-                        log.info(f"Parsed list: {current}/{max_p}. Names: {p_names}")
+                        log.info("Parsed list: %s/%s. Names: %s", current, max_p, p_names)
                         
-                        embed = discord.Embed(title="Server Status", color=discord.Color.blue())
+                        embed = _LIST_EMBED_TEMPLATE.copy()
                         embed.add_field(name="Capacity⚡", value=f"• **{current} / {max_p}**", inline=False)
                         
-                        p_text = "\n".join([f"• `{n}`" for n in p_names]) if p_names else "*No players online.*"
-                        if len(p_text) > 1020:
-                            p_text = p_text[:1017] + "\n..."
-                            
+                        p_text = "\n".join(f"• `{n}`" for n in p_names) if p_names else "*No players online.*"
+                        p_text = _truncate(p_text, 1020, "\n...")
+
+
                         embed.add_field(name="Active Players👥", value=p_text, inline=False)
-                        embed.timestamp = datetime.now(timezone.utc)
+                        embed.timestamp = utcnow()
                         embed.set_footer(text=f"Req by {ctx.author.display_name}")
                         await ctx.followup.send(embed=embed, ephemeral=False)
                     except Exception as e:
-                        log.exception(f"Err construct embed:{e}")
+                        log.exception("Err construct embed:%s", e)
                         await ctx.followup.send("⚠️ Err parse/display.", ephemeral=True)
                 else:
-                    log.warning(f"List success type received, but regex no match:'{cleaned_response}'")
+                    log.warning("List success type received, but regex no match:'%s'", cleaned_response)
                     await ctx.followup.send(
-                        f"⚠️ Received response, but couldn't parse details:\n```\n{cleaned_response[:1900]}\n```", 
+                        f"⚠️ Received response, but couldn't parse details:\n```\n{_truncate(cleaned_response, 1900)}\n```",
                         ephemeral=True
                     )
             else:
@@ -179,9 +222,9 @@ async def list_players_command(ctx: discord.ApplicationContext):
                 await ctx.followup.send("⚠️ Internal configuration error.", ephemeral=True)
         else:
             # Should not happen if config is correct for 'list', but handle unexpected type
-            log.warning(f"Received unexpected response type '{response_type}' for list command.")
+            log.warning("Received unexpected response type '%s' for list command.", response_type)
             await ctx.followup.send(
-                f"⚠️ Received unexpected response type:\n```\n{cleaned_response[:1900]}\n```", 
+                f"⚠️ Received unexpected response type:\n```\n{_truncate(cleaned_response, 1900)}\n```",
                 ephemeral=True
             )
     else:
@@ -189,7 +232,7 @@ async def list_players_command(ctx: discord.ApplicationContext):
 
 
 @bot.slash_command(
-    guild_ids=[config.GUILD_ID] if config.GUILD_ID else None,
+    guild_ids=_GUILD_IDS,
     name="whitelist",
     description="Adds or removes a player from the server whitelist."
 )
@@ -198,14 +241,14 @@ async def whitelist_command(
     action: str = Option(str, "Choose action", choices=["add", "remove"]),
     username: str = Option(str, "Minecraft username (case-sensitive)")
 ):
-    log.info(f"/whitelist {action} {username} by {ctx.author}")
     await ctx.defer(ephemeral=True)
-    
+    log.info("/whitelist %s %s by %s", action, username, ctx.author)
+
     if not websocket_manager.is_authenticated:
         await ctx.followup.send("❌ WS not authenticated.", ephemeral=True)
         return
         
-    if not re.match(r"^\w{3,16}$", username):
+    if not _is_valid_username(username):
         await ctx.followup.send("❌ Invalid username format.", ephemeral=True)
         return
 
@@ -218,29 +261,17 @@ async def whitelist_command(
     )
 
     if result_tuple:
-        response_type, response_log = result_tuple  # Unpack response type and raw log
-        # We typically don't need the cleaned log here unless debugging
-        # cleaned_response = strip_ansi(response_log)
-        log.info(f"Whitelist response received, type: {response_type}")
-
-        # Default message
-        response_message = f"🟡 Command '{command_to_send}' sent, unknown result ({response_type})."
-
-        # --- Compare response_type against config constants ---
-        if response_type == config.WL_ADD_OK:
-            response_message = f"✅ Added `{username}` to the whitelist."
-        elif response_type == config.WL_ALREADY:
-            response_message = f"ℹ️ Player `{username}` is already whitelisted."
-        elif response_type == config.WL_RM_OK:
-            response_message = f"✅ Removed `{username}` from the whitelist."
-        elif response_type == config.WL_NOT_LISTED:
-            response_message = f"ℹ️ Player `{username}` is not on the whitelist."
-        elif response_type == config.WL_NOT_EXIST:
-            response_message = f"❌ Player `{username}` does not exist."
+        response_type, _ = result_tuple  # Only the response type matters here
+        log.info("Whitelist response received, type: %s", response_type)
+
+        # --- Look up the reply template precomputed at import ---
+        template = config.WL_MESSAGES.get(response_type)
+        if template:
+            response_message = template.format(u=username)
         else:
-            log.error(f"Received unexpected response type '{response_type}' for whitelist command.")
+            log.error("Received unexpected response type '%s' for whitelist command.", response_type)
             # Potentially show raw log in this case? Be careful with sensitive info.
-            # response_message = f"⚠️ Unexpected response type: {response_type}"
+            response_message = f"🟡 Command '{command_to_send}' sent, unknown result ({response_type})."
 
         await ctx.followup.send(response_message, ephemeral=True)
     else:
@@ -265,23 +296,33 @@ async def run_discord_bot():
         log.info("Discord bot task was cancelled.")
         # No need to set shutdown_event here, cancellation is usually part of shutdown
     except Exception as e:
-        log.exception(f"Unhandled exception in run_discord_bot: {e}")
+        log.exception("Unhandled exception in run_discord_bot: %s", e)
         shutdown_event.set()  # Signal shutdown on unexpected errors
     finally:
         log.info("run_discord_bot coroutine finished.")
 
+async def _cancel_and_wait(task: asyncio.Task):
+    if not task.done():
+        task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
 async def main():
     loop = asyncio.get_running_loop()
     log.debug("Registering signals...")
+    # Register shutdown_event.set directly — no wrapper frame or log
+    # formatting between signal delivery and the event being set.
     for sig in (signal.SIGINT, signal.SIGTERM):
         try:
-            loop.add_signal_handler(sig, handle_signal, sig, None)
-            log.debug(f"Registered asyncio handler for {sig}.")
+            loop.add_signal_handler(sig, shutdown_event.set)
+            log.debug("Registered asyncio handler for %s.", sig)
         except NotImplementedError:
-            log.warning(f"Asyncio handler not supported for {sig}. Using fallback.")
-            signal.signal(sig, handle_signal)
+            log.warning("Asyncio handler not supported for %s. Using fallback.", sig)
+            signal.signal(sig, lambda *_: shutdown_event.set())
         except Exception as e:
-            log.error(f"Failed signal handler setup for {sig}: {e}")
+            log.error("Failed signal handler setup for %s: %s", sig, e)
     
     log.info("Launching bot...")
     discord_task = loop.create_task(run_discord_bot(), name="DiscordBotTask")
@@ -289,28 +330,22 @@ async def main():
     log.info("Waiting for shutdown signal...")
     await shutdown_event.wait()
     log.info("Shutdown event received.")
-    
+
+    # The three teardowns are independent; run them concurrently instead of
+    # serializing their network round trips (and padding with blind sleeps).
     log.info("Initiating final cleanup...")
-    await asyncio.sleep(0.1)
-    
-    if websocket_manager:
-        log.info("Stopping WS manager...")
-        await websocket_manager.stop()
-    
-    if bot and not bot.is_closed():
-        log.info("Closing bot...")
-        await bot.close()
-    
-    if discord_task and not discord_task.done():
-        log.info("Cancelling Discord task...")
-        discord_task.cancel()
-        await discord_task
-    
-    await asyncio.sleep(0.5)
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(websocket_manager.stop())
+        if not bot.is_closed():
+            tg.create_task(bot.close())
+        tg.create_task(_cancel_and_wait(discord_task))
     log.info("Cleanup complete.")
 
 if __name__ == "__main__":
     if config.missing_vars:
         log.critical("Missing config. Aborting.")
     else:
+        if uvloop is not None:
+            uvloop.install()
+            log.info("uvloop installed as event loop policy.")
         asyncio.run(main())
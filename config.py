@@ -15,6 +15,15 @@ WL_RM_OK: Final = "WL_RM_OK"
 WL_NOT_LISTED: Final = "WL_NOT_LISTED"
 WL_NOT_EXIST: Final = "WL_NOT_EXIST"
 
+# Response-type constant -> user-facing reply template ({u} = username)
+WL_MESSAGES: Final[Dict[str, str]] = {
+    WL_ADD_OK: "✅ Added `{u}` to the whitelist.",
+    WL_ALREADY: "ℹ️ Player `{u}` is already whitelisted.",
+    WL_RM_OK: "✅ Removed `{u}` from the whitelist.",
+    WL_NOT_LISTED: "ℹ️ Player `{u}` is not on the whitelist.",
+    WL_NOT_EXIST: "❌ Player `{u}` does not exist.",
+}
+
 # --- (Discord <-> WebSocket <-> Pterodactyl) Buffer Config ---
 TOKEN = os.getenv("DISCORD_TOKEN"); GUILD_ID = os.getenv("DISCORD_GUILD_ID")
 try: GUILD_ID = int(GUILD_ID) if GUILD_ID else None
@@ -22,14 +31,18 @@ except ValueError: logging.critical("DISCORD_GUILD_ID invalid!"); GUILD_ID = Non
 PTERODACTYL_URL = os.getenv("PTERODACTYL_URL");
 PTERODACTYL_API_KEY = os.getenv("PTERODACTYL_API_KEY");
 PTERODACTYL_SERVER_ID = os.getenv("PTERODACTYL_SERVER_ID")
-WS_RECONNECT_MIN_DELAY = 1.0;
-WS_RECONNECT_MAX_DELAY = 60.0;
-WS_RECONNECT_FACTOR = 2.0
-WS_PING_INTERVAL = 20; WS_PING_TIMEOUT = 10
-LOG_BUFFER_SIZE = 500
+WS_RECONNECT_MIN_DELAY: Final = 1.0
+WS_RECONNECT_MAX_DELAY: Final = 60.0
+WS_RECONNECT_FACTOR: Final = 2.0
+WS_PING_INTERVAL: Final = 20; WS_PING_TIMEOUT: Final = 10
+LOG_BUFFER_SIZE: Final = 500
+# Receive-side batching: max frames drained per loop turn, and how long to
+# probe for an already-buffered frame before processing the batch.
+WS_RECV_BATCH_LIMIT: Final = 16
+WS_RECV_DRAIN_TIMEOUT: Final = 0.001
 
 # --- Command/Response Configuration ---
-COMMAND_RESPONSE_TIMEOUT = 5.0
+COMMAND_RESPONSE_TIMEOUT: Final = 5.0
 
 # Patterns match CLEANED log lines (ANSI codes, timestamps stripped)
 # Order matters: More specific patterns should come first if overlap exists.
@@ -39,19 +52,44 @@ COMMAND_RESPONSES: Dict[str, List[Tuple[Pattern[str], str]]] = {
     ],
     "whitelist": [
         # Order: specific successes, specific failures, general failures
-        (re.compile(r"Added (?P<username>\S+) to the whitelist"), WL_ADD_OK),
+        (re.compile(r"Added \S+ to the whitelist"), WL_ADD_OK),
         (re.compile(r"Player is already whitelisted"), WL_ALREADY),
-        (re.compile(r"Removed (?P<username>\S+) from the whitelist"), WL_RM_OK),
+        (re.compile(r"Removed \S+ from the whitelist"), WL_RM_OK),
         (re.compile(r"Player is not whitelisted"), WL_NOT_LISTED),
         (re.compile(r"That player does not exist"), WL_NOT_EXIST),
     ],
     # "seed": [(re.compile(r"Seed: \[([-\d]+)\]"), "SEED_SUCCESS")],
 }
 
+# One alternation per command key, classified via match.lastgroup: a single
+# engine entry per line instead of one search per pattern. Group names are
+# the response-type constants, so pattern order above is preserved.
+# re.ASCII: server console lines are ASCII, so \d/\S/\w can use the narrow
+# byte-class tables instead of Unicode property lookups.
+UNIFIED_RESPONSES: Dict[str, Pattern[str]] = {
+    key: re.compile("|".join(f"(?P<{tag}>{p.pattern})" for p, tag in entries), re.ASCII)
+    for key, entries in COMMAND_RESPONSES.items()
+}
+
+# Cheap literal pre-filter per command key: a line that contains none of
+# these substrings cannot match the key's patterns, so the regex engine is
+# never entered for the (dominant) chat/noise lines.
+RESPONSE_NEEDLES: Dict[str, Tuple[str, ...]] = {
+    "list": ("players online:",),
+    "whitelist": ("whitelist", "does not exist"),
+}
+
+# Strip the full ECMA-48 escape family instead of just CSI sequences.
+# Minecraft/Pterodactyl consoles emit only CSI (SGR colour codes), so the
+# narrow pattern is the default; flip this for servers that emit Fe escapes.
+ANSI_BROAD_PATTERN: Final = False
+
 # --- Logging Configuration ---
-LOG_LEVEL = logging.INFO # Keep INFO unless debugging
-LOG_FORMAT = '%(asctime)s:%(levelname)s:%(name)s:%(funcName)s: %(message)s'
-logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
+LOG_LEVEL: Final = logging.INFO # Keep INFO unless debugging
+LOG_FORMAT: Final = '%(asctime)s:%(levelname)s:%(name)s:%(funcName)s: %(message)s'
+# Guard against duplicate handlers if something configured logging first
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=LOG_LEVEL, format=LOG_FORMAT)
 log = logging.getLogger(__name__)
 
 # --- Validation ---
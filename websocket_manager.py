@@ -5,28 +5,130 @@ import logging
 import random
 import re
 from collections import deque
-from typing import Deque, Optional, Pattern, Tuple, List, Dict
+from itertools import islice
+from typing import Callable, Deque, Match, Optional, Tuple, List, Dict
 
 import aiohttp
 import websockets
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        # wings speaks text frames, so decode orjson's bytes output
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
 from config import (PTERODACTYL_URL, PTERODACTYL_API_KEY, PTERODACTYL_SERVER_ID,
                     WS_RECONNECT_MIN_DELAY, WS_RECONNECT_MAX_DELAY,
                     WS_RECONNECT_FACTOR, WS_PING_INTERVAL, WS_PING_TIMEOUT,
-                    LOG_BUFFER_SIZE, COMMAND_RESPONSES, COMMAND_RESPONSE_TIMEOUT)
+                    LOG_BUFFER_SIZE, UNIFIED_RESPONSES, RESPONSE_NEEDLES,
+                    COMMAND_RESPONSE_TIMEOUT, WS_RECV_BATCH_LIMIT,
+                    WS_RECV_DRAIN_TIMEOUT, ANSI_BROAD_PATTERN)
 
 log = logging.getLogger(__name__)
 
-ansi_escape_pattern = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+# The console only ever emits CSI sequences (SGR colour codes), so the
+# default pattern skips the two-char Fe alternation; the broad ECMA-48
+# pattern stays available via config for servers that do emit Fe escapes.
+ansi_escape_pattern = (re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', re.ASCII)
+                       if ANSI_BROAD_PATTERN else
+                       re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]', re.ASCII))
+# Fallback switch: route strip_ansi through the regex instead of the
+# hand-rolled scanner (e.g. to cross-check the scanner's output).
+_ANSI_USE_REGEX = False
+_ansi_sub = ansi_escape_pattern.sub
+
+
+def _strip_ansi_scan(text: str) -> str:
+    """Single-pass ANSI stripper copying ranges between escape sequences.
+
+    Handles CSI sequences (ESC [ params intermediates final) and, with
+    ANSI_BROAD_PATTERN set, single-char Fe escapes (ESC @ .. ESC _) —
+    mirroring whichever ansi_escape_pattern is selected, without the regex
+    engine's per-line setup and backtracking machinery.
+    """
+    out = []
+    append = out.append
+    i = 0
+    n = len(text)
+    while True:
+        esc = text.find('\x1B', i)
+        if esc == -1:
+            append(text[i:])
+            break
+        append(text[i:esc])
+        j = esc + 1
+        if j >= n:
+            append('\x1B')
+            break
+        c = text[j]
+        if c == '[':
+            # CSI: parameter bytes 0x30-0x3F, intermediates 0x20-0x2F,
+            # then one final byte 0x40-0x7E.
+            j += 1
+            while j < n and '\x30' <= text[j] <= '\x3F':
+                j += 1
+            while j < n and '\x20' <= text[j] <= '\x2F':
+                j += 1
+            if j < n and '\x40' <= text[j] <= '\x7E':
+                i = j + 1
+            else:
+                # Malformed sequence: keep it, like the regex would.
+                append(text[esc:j])
+                i = j
+        elif ANSI_BROAD_PATTERN and '\x40' <= c <= '\x5F':
+            i = j + 1  # two-char Fe escape
+        else:
+            append('\x1B')
+            i = j
+    return ''.join(out)
+
+# Static halves of the wings envelopes; most payloads need no JSON escaping,
+# so sends can splice strings instead of serializing a fresh dict. Kept as
+# str: wings expects text frames, bytes would go out as a binary frame.
+_CMD_FRAME_PREFIX = '{"event":"send command","args":["'
+_AUTH_FRAME_PREFIX = '{"event":"auth","args":["'
+_FRAME_SUFFIX = '"]}'
+
+
+def _splice_frame(prefix: str, arg: str) -> str:
+    """Build a one-arg event frame, falling back to the JSON serializer for
+    args that would need escaping (quotes, backslashes, control chars)."""
+    if arg.isascii() and arg.isprintable() and '"' not in arg and '\\' not in arg:
+        return prefix + arg + _FRAME_SUFFIX
+    event = "send command" if prefix is _CMD_FRAME_PREFIX else "auth"
+    return _json_dumps({"event": event, "args": [arg]})
+
+# Events the message loop actually acts on; frames without one of these
+# markers (the dominant "stats"/"status" stream) are dropped before JSON
+# parsing ever allocates an object tree for them. Byte literals: frames are
+# received undecoded and only the JSON parser validates UTF-8.
+_RELEVANT_FRAME_MARKERS = (b'"console output"', b'"token exp', b'"auth ')
 
 # --- Utility Function (defined within module) ---
+def _strip_ansi_str(text: str) -> str:
+    """strip_ansi for inputs already known to be str (the ingest path);
+    skips the public function's coercion check."""
+    # Fast path: most console lines carry no escape sequences at all, and a
+    # single-char containment test is a C-level memchr vs a full scan.
+    if '\x1B' not in text:
+        return text
+    if _ANSI_USE_REGEX:
+        return _ansi_sub('', text)
+    return _strip_ansi_scan(text)
+
 def strip_ansi(text: object) -> str:
     if not isinstance(text, str):
-        try: 
+        try:
             text = str(text)
-        except Exception: 
+        except Exception:
             return ""
-    return ansi_escape_pattern.sub('', text)
+    return _strip_ansi_str(text)
 
 # --- Websocket Manager Class ---
 class WebsocketManager:
@@ -35,14 +137,33 @@ class WebsocketManager:
         self._server_id = PTERODACTYL_SERVER_ID
         self._panel_url = PTERODACTYL_URL
         self._websocket_url = f"{self._panel_url}/api/client/servers/{self._server_id}/websocket"
+        # Static request pieces built once instead of per details fetch
+        self._auth_headers = {'Authorization': f'Bearer {self._api_key}', 'Accept': 'application/json'}
+        self._details_timeout = aiohttp.ClientTimeout(total=10)
         self._session: Optional[aiohttp.ClientSession] = None
         self._websocket: Optional[websockets.WebSocketClientProtocol] = None
         self._listener_task: Optional[asyncio.Task] = None
         self._is_connected: bool = False
         self._reconnect_delay: float = WS_RECONNECT_MIN_DELAY
         self.log_buffer: Deque[str] = deque(maxlen=LOG_BUFFER_SIZE)
+        # Parallel buffer of ANSI-stripped lines, populated once at ingest so
+        # scans and accessors never re-strip the same line. Appends happen in
+        # lockstep with log_buffer, keeping indices aligned.
+        self.clean_log_buffer: Deque[str] = deque(maxlen=LOG_BUFFER_SIZE)
+        # In-flight command waiters: (pattern, needles, future). The message
+        # loop tests each newly cleaned line against these as it arrives and
+        # resolves the future with (response_type, cleaned_line), so waiters
+        # never rescan the buffer — work is O(new lines x active commands).
+        self._response_waiters: List[Tuple[Callable[[str], Optional[Match[str]]], Tuple[str, ...], asyncio.Future]] = []
+        # Resolved by _message_loop when the auth handshake reply arrives,
+        # so there is a single ws.recv() path for all inbound frames.
+        self._auth_future: Optional[asyncio.Future] = None
         self.is_authenticated: bool = False
-        self._command_responses: Dict[str, List[Tuple[Pattern[str], str]]] = COMMAND_RESPONSES
+        # Pre-bound .search per command key: the per-line matcher calls the
+        # bound method directly, no dict or attribute lookup on the hot path.
+        self._scanners: Dict[str, Callable[[str], Optional[Match[str]]]] = {
+            key: pattern.search for key, pattern in UNIFIED_RESPONSES.items()
+        }
         self._command_response_timeout: float = COMMAND_RESPONSE_TIMEOUT
 
     # --- Core Logic Methods ---
@@ -51,23 +172,23 @@ class WebsocketManager:
             log.error("aiohttp inactive.")
             return None
             
-        h = {'Authorization': f'Bearer {self._api_key}', 'Accept': 'application/json'}
-        log.debug(f"Req WS details:{self._websocket_url}")
-        
+        log.debug("Req WS details:%s", self._websocket_url)
+
         try:
-            async with self._session.get(self._websocket_url, headers=h, timeout=10) as r:
+            async with self._session.get(self._websocket_url, headers=self._auth_headers,
+                                         timeout=self._details_timeout) as r:
                 if r.status == 200: 
                     d = await r.json()
                     log.info("Got WS details.")
                     return d.get('data')
                 else: 
-                    log.error(f"Fail WS details:{r.status}-{await r.text()}")
+                    log.error("Fail WS details:%s-%s", r.status, await r.text())
                     return None
         except asyncio.TimeoutError: 
             log.error("Timeout fetching WS details.")
             return None
         except aiohttp.ClientError as e: 
-            log.error(f"HTTP error fetching WS details: {e}")
+            log.error("HTTP error fetching WS details: %s", e)
             return None
         except Exception as e: 
             log.exception("Err fetch WS details.")
@@ -79,115 +200,198 @@ class WebsocketManager:
             d = await self._get_websocket_details()
             
             if not d: 
-                log.warning(f"No WS details. Retry {self._reconnect_delay:.1f}s")
+                log.warning("No WS details. Retry %.1fs", self._reconnect_delay)
                 await asyncio.sleep(self._reconnect_delay)
                 self._update_reconnect_delay(True)
                 continue
                 
             url, tok = d['socket'], d['token']
-            log.info(f"Connecting WS:{url}")
+            log.info("Connecting WS:%s", url)
             
             try:
-                async with websockets.connect(url, origin=self._panel_url, ping_interval=WS_PING_INTERVAL, ping_timeout=WS_PING_TIMEOUT) as ws:
+                # compression=None: wings sends small JSON frames, so
+                # permessage-deflate costs CPU on every frame for nothing.
+                # max_size bounds a single frame at 1 MiB (console lines are
+                # tiny; the default is 16x that).
+                async with websockets.connect(url, origin=self._panel_url,
+                                              ping_interval=WS_PING_INTERVAL, ping_timeout=WS_PING_TIMEOUT,
+                                              compression=None, max_size=2**20) as ws:
                     self._websocket = ws
                     self._is_connected = True
                     log.info("WS connected.")
                     self._update_reconnect_delay(False)
-                    
-                    if not await self._authenticate(ws, tok): 
+
+                    # The message loop owns ws.recv() from the start; it
+                    # resolves the auth future when the reply shows up.
+                    self._auth_future = asyncio.get_running_loop().create_future()
+                    message_task = asyncio.create_task(self._message_loop(ws))
+
+                    if not await self._authenticate(ws, tok):
                         log.warning("Auth failed, retry.")
+                        message_task.cancel()
+                        await asyncio.gather(message_task, return_exceptions=True)
                         await asyncio.sleep(5)
                         continue
-                        
+
                     self.is_authenticated = True
                     log.info("WS authenticated. Listening...")
-                    await self._message_loop(ws)
+                    await message_task
             except websockets.exceptions.WebSocketException as e: 
-                log.error(f"WS connection failed:{e}")
+                log.error("WS connection failed:%s", e)
             except asyncio.CancelledError: 
                 log.info("WS listener cancelled.")
                 self._is_connected = False
                 raise
             except Exception as e: 
-                log.exception(f"Unexpected WS connect error:{e}")
+                log.exception("Unexpected WS connect error:%s", e)
                 
             self._is_connected = False
             self.is_authenticated = False
             self._websocket = None
-            log.info(f"WS disconnected. Retry {self._reconnect_delay:.1f}s")
+            log.info("WS disconnected. Retry %.1fs", self._reconnect_delay)
             await asyncio.sleep(self._reconnect_delay)
             self._update_reconnect_delay(True)
 
     async def _authenticate(self, ws, token) -> bool:
-        try: 
-            await ws.send(json.dumps({"event": "auth", "args": [token]}))
+        try:
+            await ws.send(_splice_frame(_AUTH_FRAME_PREFIX, token))
             log.info("Sent auth token.")
-        except Exception as e: 
-            log.error(f"WS send err auth:{e}")
+        except Exception as e:
+            log.error("WS send err auth:%s", e)
             return False
-            
-        try: 
-            raw = await asyncio.wait_for(ws.recv(), timeout=10)
-            data = json.loads(raw)
-        except asyncio.TimeoutError: 
+
+        # The reply is picked up by _message_loop, which resolves the future;
+        # it also resolves it False if the connection dies first.
+        try:
+            return await asyncio.wait_for(asyncio.shield(self._auth_future), timeout=10)
+        except asyncio.TimeoutError:
             log.error("WS auth timed out.")
             return False
-        except websockets.exceptions.ConnectionClosed: 
-            log.warning("WS closed during auth.")
-            return False
-        except Exception as e: 
-            log.exception(f"WS auth recv/decode err:{e}")
-            return False
-            
-        if data.get("event") == "auth success": 
-            log.info("WS auth ok.")
-            return True
-        else: 
-            log.error(f"WS auth fail:{data.get('args', ['err'])[0]}")
+        except Exception as e:
+            log.exception("WS auth err:%s", e)
             return False
 
     async def _message_loop(self, ws):
         """Handles received WebSocket messages."""
-        while True:
-            line = None  # Initialize line to None at the start of each loop iteration
+        # Per-frame names bound once outside the loop (LOAD_FAST vs
+        # LOAD_GLOBAL/LOAD_ATTR on every frame)
+        recv = ws.recv
+        loads = _json_loads
+        wait_for = asyncio.wait_for
+        markers = _RELEVANT_FRAME_MARKERS
+
+        closing = False
+        while not closing:
             try:
-                msg = await ws.recv()
-                data = json.loads(msg)
-                ev = data.get("event")
+                # decode=False skips the library's per-frame UTF-8 decode; the
+                # JSON parser validates the bytes itself.
+                batch = [await recv(decode=False)]
             except websockets.exceptions.ConnectionClosedOK:
                 log.info("WS closed normally.")
                 break
             except websockets.exceptions.ConnectionClosedError as e:
-                log.warning(f"WS closed err:{e}")
+                log.warning("WS closed err:%s", e)
                 break
-            except json.JSONDecodeError as e:
-                log.error(f"JSON decode err: {e}. Raw: {msg[:100]}...")
-                continue  # Skip this message
             except Exception as e:
-                log.exception(f"WS loop err:{e}")
+                log.exception("WS loop err:%s", e)
                 break  # Exit loop on other errors
 
-            # Process based on event type
-            if ev == "console output":
-                args = data.get("args", [])
-                line = args[0] if args else None  # Assign line HERE
-                if line is not None:
-                    self.log_buffer.append(line)
-                    log.debug(f"Log raw:{str(line)}...")
-            elif ev == "status":
-                log.debug(f"Status:{data.get('args', ['N/A'])[0]}")
-            elif ev == "token expiring" or ev == "token expired":
-                log.warning(f"'{ev}' received. Reconnecting.")
-                break
-            # else: # Optionally log unhandled events
-            #     log.debug(f"Unhandled WS event: {ev}")
+            # Drain frames that are already buffered so a burst of console
+            # output is processed back-to-back in a single loop turn.
+            while len(batch) < WS_RECV_BATCH_LIMIT:
+                try:
+                    batch.append(await wait_for(recv(decode=False), WS_RECV_DRAIN_TIMEOUT))
+                except (asyncio.TimeoutError, websockets.exceptions.ConnectionClosed):
+                    break
+
+            new_lines: List[str] = []
+            for msg in batch:
+                # Substring probe before the full parse; only frames that can
+                # carry a relevant event are worth decoding.
+                if not any(marker in msg for marker in markers):
+                    continue
+
+                try:
+                    data = loads(msg)
+                    ev = data.get("event")
+                except ValueError as e:
+                    log.error("JSON decode err: %s. Raw: %s...", e, msg[:100])
+                    continue  # Skip this message
+
+                # Process based on event type
+                if ev == "console output":
+                    args = data.get("args", [])
+                    line = args[0] if args else None
+                    if line is not None:
+                        # Enforce str here so the buffers and accessors can
+                        # rely on it (JSON args are str in practice anyway)
+                        new_lines.append(line if isinstance(line, str) else str(line))
+                elif ev == "auth success":
+                    log.info("WS auth ok.")
+                    if self._auth_future and not self._auth_future.done():
+                        self._auth_future.set_result(True)
+                elif ev == "auth error":
+                    log.error("WS auth fail:%s", data.get("args"))
+                    if self._auth_future and not self._auth_future.done():
+                        self._auth_future.set_result(False)
+                elif ev == "token expiring" or ev == "token expired":
+                    log.warning("'%s' received. Reconnecting.", ev)
+                    closing = True
+                    break
+                # else: # Optionally log unhandled events
+                #     log.debug(f"Unhandled WS event: {ev}")
+
+            # Flush the batch's console lines in one go: a single stripping
+            # pass over the joined text instead of one per line (console
+            # output never contains the \x1e separator), one deque extend
+            # each, and one event wakeup for however many lines arrived.
+            # Flushed even when a token event set `closing`, so waiters see
+            # every line that beat the reconnect.
+            if new_lines:
+                # One guarded debug per batch instead of an f-string per line
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Console batch (%d lines): %s", len(new_lines), new_lines)
+                joined = '\x1e'.join(new_lines)
+                if joined.count('\x1e') == len(new_lines) - 1:
+                    cleaned = [l.strip() for l in _strip_ansi_str(joined).split('\x1e')]
+                else:
+                    # A line carried the RS separator itself (JSON \u001e
+                    # decodes fine): clean per line so the split can't
+                    # mis-segment and the buffers stay index-aligned.
+                    cleaned = [_strip_ansi_str(l).strip() for l in new_lines]
+                self.log_buffer.extend(new_lines)
+                self.clean_log_buffer.extend(cleaned)
+                if self._response_waiters:
+                    self._match_waiters(cleaned)
+
+        # Don't leave a pending auth handshake hanging on a dead connection
+        if self._auth_future and not self._auth_future.done():
+            self._auth_future.set_result(False)
+
+    def _match_waiters(self, cleaned_lines: List[str]) -> None:
+        """Tests freshly cleaned lines against in-flight command waiters and
+        resolves matching futures with (response_type, cleaned_line)."""
+        for cleaned_line in cleaned_lines:
+            if not cleaned_line:
+                continue
+            # Copy: resolved waiters are removed while iterating
+            for waiter in self._response_waiters[:]:
+                search, needles, future = waiter
+                # Literal pre-filter: skip the regex engine for lines that
+                # can't possibly match this waiter's patterns.
+                if needles and not any(n in cleaned_line for n in needles):
+                    continue
+                match = search(cleaned_line)
+                if match and not future.done():
+                    future.set_result((match.lastgroup, cleaned_line))
+                    self._response_waiters.remove(waiter)
 
     def _update_reconnect_delay(self, i: bool, r: bool = False):
         self._reconnect_delay = (WS_RECONNECT_MIN_DELAY if r or not i 
                                 else min(self._reconnect_delay * WS_RECONNECT_FACTOR, WS_RECONNECT_MAX_DELAY))
         j = random.uniform(0.1, self._reconnect_delay * 0.1 + 0.1)
         self._reconnect_delay = min(self._reconnect_delay + j, WS_RECONNECT_MAX_DELAY)
-        log.debug(f"Reconnect delay:{self._reconnect_delay:.1f}s")
+        log.debug("Reconnect delay:%.1fs", self._reconnect_delay)
 
     # --- Public Methods ---
     async def start(self):
@@ -196,7 +400,11 @@ class WebsocketManager:
             return
             
         if not self._session or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            # Keep the panel connection warm across reconnect attempts: the
+            # details fetch reuses a kept-alive TLS connection and cached DNS
+            # instead of a fresh handshake each time.
+            connector = aiohttp.TCPConnector(limit=4, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
             log.info("Created session.")
             
         log.info("Starting WS task...")
@@ -227,108 +435,111 @@ class WebsocketManager:
 
     async def send_command(self, cmd: str) -> bool:
         if not self.is_authenticated or not self._websocket:
-            log.error(f"Cannot send '{cmd}': WS not ready.")
+            log.error("Cannot send '%s': WS not ready.", cmd)
             return False
             
-        pl = {"event": "send command", "args": [cmd]}
-        log.info(f"Sending cmd: {cmd}")
-        
+        log.info("Sending cmd: %s", cmd)
+
         try:
-            await self._websocket.send(json.dumps(pl))
+            await self._websocket.send(_splice_frame(_CMD_FRAME_PREFIX, cmd))
             return True
         except websockets.exceptions.ConnectionClosed:
-            log.error(f"Fail send '{cmd}': Conn closed.")
+            log.error("Fail send '%s': Conn closed.", cmd)
             self._is_connected = False
             self.is_authenticated = False
             self._websocket = None
             return False
         except Exception as e:
-            log.exception(f"Error sending '{cmd}': {e}")
+            log.exception("Error sending '%s': %s", cmd, e)
             return False
         
     async def send_command_and_get_response(self, command_to_send: str, response_command_key: str) -> Optional[Tuple[str, str]]:
         """
-        Sends a command, then polls the buffer scanning backwards for the LATEST
-        log line matching any pattern associated with the response_command_key.
+        Sends a command and awaits the first subsequent log line matching a
+        pattern associated with the response_command_key. Matching happens
+        inline in the message loop, so there is no buffer scanning here.
 
         Args:
             command_to_send: The command string to send.
             response_command_key: The key in config.COMMAND_RESPONSES.
 
         Returns:
-            A tuple (response_type_constant, raw_log_line) if found, otherwise None.
+            A tuple (response_type_constant, cleaned_log_line) if found, otherwise None.
         """
         if not self.is_authenticated:
-            log.error(f"Cannot process '{command_to_send}': WS not authenticated.")
+            log.error("Cannot process '%s': WS not authenticated.", command_to_send)
             return None
 
-        # Get the list of (Pattern, ResponseType) tuples for this command key
-        response_options = self._command_responses.get(response_command_key)
-        if not response_options:
-            log.error(f"No response definitions found for key '{response_command_key}'")
+        # One pre-bound alternation search per key; match.lastgroup names the
+        # response type
+        search = self._scanners.get(response_command_key)
+        if not search:
+            log.error("No response definitions found for key '%s'", response_command_key)
             return None
+        needles = RESPONSE_NEEDLES.get(response_command_key, ())
 
-        # --- Send Command ---
-        if not await self.send_command(command_to_send):
-            return None # Error sending
-
-        # --- Wait for Response (Polling with Reverse Scan) ---
-        start_time = asyncio.get_running_loop().time()
-        log.debug(f"Waiting {self._command_response_timeout:.1f}s for LATEST RESPONSE for '{response_command_key}' after sending '{command_to_send}'.")
+        # Register before sending so the response can't slip through between
+        # the send and the wait; only lines arriving afterwards are tested.
+        future = asyncio.get_running_loop().create_future()
+        waiter = (search, needles, future)
+        self._response_waiters.append(waiter)
+        try:
+            if not await self.send_command(command_to_send):
+                return None # Error sending
 
-        while asyncio.get_running_loop().time() - start_time < self._command_response_timeout:
-            await asyncio.sleep(0.1) # Short delay before scan
+            timeout = self._command_response_timeout
+            log.debug("Waiting %.1fs for response for '%s' after sending '%s'.", timeout, response_command_key, command_to_send)
             try:
-                current_buffer_snapshot = list(self.log_buffer)
-                # log.debug(f"Unified Rev Scan Poll: Buf len={len(current_buffer_snapshot)}")
-
-                # Scan backwards (newest to oldest)
-                for i in range(len(current_buffer_snapshot) - 1, -1, -1):
-                    raw_line = current_buffer_snapshot[i]
-                    cleaned_line = strip_ansi(raw_line).strip()
-                    if not cleaned_line: continue
-
-                    #log.debug(f"  Unified Rev Scan Idx {i}: Clean='{cleaned_line[:80]}...'")
-                    # Check against all patterns for the key, in order
-                    for pattern, response_type in response_options:
-                        if pattern.search(cleaned_line):
-                            log.info(f"Found LATEST match for '{response_command_key}' (type: {response_type}) at index {i}.")
-                            return response_type, raw_line # Return type constant and raw line
+                response_type, cleaned_line = await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                log.warning("Timeout (%.1fs) finding response for '%s' command '%s'.", timeout, response_command_key, command_to_send)
+                return None
 
-            except Exception as e:
-                 log.exception(f"Error during unified reverse buffer scan poll: {e}")
-
-            await asyncio.sleep(0.25) # Polling interval
-
-        log.warning(f"Timeout ({self._command_response_timeout:.1f}s) finding response for '{response_command_key}' command '{command_to_send}'.")
-        return None
+            log.info("Found match for '%s' (type: %s).", response_command_key, response_type)
+            return response_type, cleaned_line
+        finally:
+            if waiter in self._response_waiters:
+                self._response_waiters.remove(waiter)
 
     # --- Log Accessor Methods ---
     def get_last_log(self) -> str | None:
         try:
-            return str(self.log_buffer[-1]) if self.log_buffer else None
+            return self.log_buffer[-1] if self.log_buffer else None
         except Exception as e:
-            log.error(f"Err get_last_log: {e}")
+            log.error("Err get_last_log: %s", e)
             return None
 
     def get_clean_last_log(self) -> str | None:
-        last = self.get_last_log()
-        return strip_ansi(last) if last else None
+        try:
+            return self.clean_log_buffer[-1] if self.clean_log_buffer else None
+        except Exception as e:
+            log.error("Err get_clean_last_log: %s", e)
+            return None
 
     def get_recent_logs(self, num: int = 1) -> list[str]:
         if num < 1:
             return []
         try:
-            buf_list = list(self.log_buffer)
-            str_logs = [str(l) for l in buf_list if isinstance(l, (str, bytes, bytearray))]
-            return str_logs[-num:]
+            # Walk only the tail via reversed()+islice instead of copying the
+            # whole deque; reversed again to restore oldest-first order.
+            # Entries are guaranteed str at ingest, so no per-element checks.
+            tail = list(islice(reversed(self.log_buffer), num))
+            tail.reverse()
+            return tail
         except Exception as e:
-            log.error(f"Err get_recent_logs: {e}")
+            log.error("Err get_recent_logs: %s", e)
             return []
 
     def get_clean_recent_logs(self, num: int = 1) -> list[str]:
-        raw = self.get_recent_logs(num)
-        return [strip_ansi(l) for l in raw]
+        if num < 1:
+            return []
+        try:
+            tail = list(islice(reversed(self.clean_log_buffer), num))
+            tail.reverse()
+            return tail
+        except Exception as e:
+            log.error("Err get_clean_recent_logs: %s", e)
+            return []
 
     @property
     def is_connected(self) -> bool: